@@ -0,0 +1,78 @@
+"""
+Gesture checks shared by main.py and gui.py, compiled with numba when it is installed.
+
+Each kernel has an explicit signature, so numba compiles it when this module is
+imported and cache=True stores the machine code in __pycache__; later runs load
+it from there instead of recompiling. Landmarks are one hand as a C-contiguous
+float32 array with x, y in the first two columns: (21, 3) in main.py, (21, 2) in gui.py.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the gesture helpers then run as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+@njit("boolean(float32[:, ::1], float32)", cache=True, fastmath=True)
+def is_pinch_nb(lm, thr2):
+    # thumb tip (4) vs index tip (8); squared distance against a squared threshold, no sqrt
+    dx = lm[8, 0] - lm[4, 0]
+    dy = lm[8, 1] - lm[4, 1]
+    return (dx * dx + dy * dy) < thr2
+
+
+# fingertips and the knuckles they must drop below for a fist
+FIST_TIP_IDS = np.array([8, 12, 16, 20])
+FIST_BASE_IDS = np.array([5, 9, 13, 17])
+
+
+@njit("boolean(float32[:, ::1])", cache=True, fastmath=True)
+def is_fist_nb(lm):
+    # if fingertip is below its knuckle (y is larger), treat as folded;
+    # fixed-length loop with & (no short-circuit) so it compiles to straight-line compares
+    folded = True
+    for i in range(4):
+        folded &= lm[FIST_TIP_IDS[i], 1] > lm[FIST_BASE_IDS[i], 1]
+    return folded
+
+
+@njit("boolean(float32[:, ::1], int64, int64)", cache=True, fastmath=True)
+def finger_extended_nb(lm, tip_id, pip_id):
+    margin = 0.01
+    return (lm[tip_id, 1] + margin) < lm[pip_id, 1]
+
+
+@njit("boolean(float32[:, ::1], float32)", cache=True, fastmath=True)
+def is_two_fingers_V_nb(lm, min_split):
+    index_ext  = finger_extended_nb(lm, 8, 6)
+    middle_ext = finger_extended_nb(lm, 12, 10)
+    ring_fold  = not finger_extended_nb(lm, 16, 14)
+    pinky_fold = not finger_extended_nb(lm, 20, 18)
+    lateral_split_ok = abs(lm[8, 0] - lm[12, 0]) > min_split
+    return index_ext & middle_ext & ring_fold & pinky_fold & lateral_split_ok
+
+
+@njit("boolean[:, ::1](float32[:, :, ::1], float32, float32, boolean[:, ::1])", cache=True, fastmath=True)
+def classify_hands_nb(pts, pinch_thr2, min_split, out):
+    """All gestures for all hands in one call: (H, 21, 3) -> out[:H] (pinch, fist, two) bools."""
+    n = pts.shape[0]
+    for h in range(n):
+        lm = pts[h]
+        out[h, 0] = is_pinch_nb(lm, pinch_thr2)
+        out[h, 1] = is_fist_nb(lm)
+        out[h, 2] = is_two_fingers_V_nb(lm, min_split)
+    return out
+
+
+def warm_up():
+    """Run every kernel once so the first real frame doesn't pay for loading them."""
+    lm = np.zeros((21, 3), dtype=np.float32)
+    is_pinch_nb(lm, 0.0025)
+    is_fist_nb(lm)
+    is_two_fingers_V_nb(lm, 0.02)
+    classify_hands_nb(np.zeros((2, 21, 3), dtype=np.float32), 0.0025, 0.02,
+                      np.empty((2, 3), dtype=np.bool_))
@@ -1,17 +1,28 @@
 import sys
 import os
 import json
-import math
 import time
+import heapq
+import itertools
+import queue
+import threading
 from dataclasses import dataclass
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 import cv2
 import mediapipe as mp
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; settings I/O falls back to the stdlib json module
+    orjson = None
 
 from pynput.keyboard import Controller as KeyboardController, Key
 from pynput.mouse import Controller as MouseController, Button
 
+from gesture_kernels import is_pinch_nb, is_fist_nb, is_two_fingers_V_nb, warm_up as warm_up_kernels
+
 USE_JSON = True  ## Use JSON ?
 
 
@@ -23,6 +34,17 @@ class AssignmentRow:
     mode: str
     repeat_hz: float
     tap_ms: int
+    resolved: object = None  # pynput Button / Key / char the action maps to, None for "none"
+
+# ---------- Immutable settings snapshot read by the worker's frame loop ----------
+@dataclass(frozen=True, slots=True)
+class WorkerSettings:
+    mirror_view: bool
+    mirror_controls: bool
+    debug_draw: bool
+    pinch_thr2: float
+    two_split_min: float
+    assignments: dict  # gesture key -> AssignmentRow
 
 # ---------- Globals / Defaults ----------
 DEFAULT_SETTINGS = {
@@ -54,10 +76,33 @@ ACTION_SUGGESTIONS = [
     
 ]
 
+# ---------- JSON helpers ----------
+def read_json(path):
+    with open(path, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def write_json(path, data):
+    if orjson:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
 # ---------- Keyboard/Mouse controllers ----------
 keyboard = KeyboardController()
 mouse = MouseController()
 
+# ---------- Landmarks for the shared gesture kernels (x/y only: a (21, 2) float32 array) ----------
+def fill_landmarks(hand, out):
+    """Copy landmark x/y into `out` in place, touching each protobuf landmark once."""
+    for i, p in enumerate(hand.landmark):
+        out[i, 0] = p.x
+        out[i, 1] = p.y
+    return out
+
+
 # ---------- Video + Mediapipe worker in QThread ----------
 class VideoWorker(QtCore.QThread):
     frame_ready = QtCore.pyqtSignal(QtGui.QImage)
@@ -72,6 +117,26 @@ class VideoWorker(QtCore.QThread):
         self.hands = None
         self.mp_draw = mp.solutions.drawing_utils
         self.cap = None
+        self.target_hz = 20  # gesture processing rate; extra camera frames are grabbed but not decoded
+        self.infer_width = 640  # frames are downscaled to this width before MediaPipe; preview stays full-res
+        self._lm_buf = np.empty((21, 2), dtype=np.float32)
+        # frame size and the derived per-frame buffers, set once the capture is open (_set_frame_size)
+        self._frame_w = 0
+        self._frame_h = 0
+        self._infer_size = None
+        self._small_buf = None
+        self._rgb_buf = None
+        # after idle_after empty frames in a row, only look for hands idle_hz times per second
+        self.idle_after = 30
+        self.idle_hz = 5
+        self._no_hand_streak = 0
+        # preview is shrunk into a reused buffer and only every preview_every-th frame is sent to the GUI
+        self.preview_width = 480
+        self.preview_every = 2
+        self._preview_size = None
+        self._preview_stride = 0
+        self._preview_buf = None
+        self._frame_emit_count = 0
 
         self.pressed = {
             "left_pinch": False, "right_pinch": False,
@@ -79,16 +144,40 @@ class VideoWorker(QtCore.QThread):
             "left_two": False,   "right_two": False
         }
         self.last_fire_ts = {k: 0.0 for k in self.pressed.keys()}
+        # key/mouse injection runs on its own thread so a slow pynput call never stalls capture
+        self._action_q = queue.Queue(maxsize=64)
+        self._action_thread = None
+        # actions with a tap release still pending; a new tap of the same action is skipped until it's sent
+        self._tapping = set()
+        self._cache_settings()
 
     def update_settings(self, new_settings):
         self.settings = new_settings.copy()
+        self._cache_settings()
         self.settings_changed.emit(self.settings)
 
+    def _cache_settings(self):
+        # the frame loop only reads this snapshot; it is rebuilt and swapped in whole on every change
+        assignments = {}
+        for k in self.settings.get("assignments", {}):
+            cfg = self.get_assignment(k)
+            if cfg is None:  # null in settings.json: leave the gesture unmapped
+                continue
+            assignments[k] = AssignmentRow(gesture=k, resolved=self.resolve_action(cfg["action"]), **cfg)
+        self._cfg = WorkerSettings(
+            mirror_view=bool(self.settings.get("mirror_view", True)),
+            mirror_controls=bool(self.settings.get("mirror_controls", False)),
+            debug_draw=bool(self.settings.get("debug_draw", True)),
+            pinch_thr2=max(0.0, float(self.get_threshold("pinch_dist", 0.05))) ** 2,
+            two_split_min=float(self.get_threshold("two_split_min", 0.02)),
+            assignments=assignments,
+        )
+
     def get_threshold(self, name, default):
         return self.settings.get("thresholds", {}).get(name, default)
 
     def resolve_hand_label(self, label):
-        if self.settings.get("mirror_controls", False):
+        if self._cfg.mirror_controls:
             return "Right" if label == "Left" else "Left"
         return label
 
@@ -106,72 +195,77 @@ class VideoWorker(QtCore.QThread):
             "tap_ms": int(item.get("tap_ms", 40))
         }
 
-    def get_key(self, key_str):
-        if isinstance(key_str, str) and key_str.startswith("Key."):
-            return getattr(Key, key_str.split(".")[1])
-        return key_str
-
-    def press_action(self, action, press=True):
+    def resolve_action(self, action):
         if not action or action == "none":
-            return
+            return None
         if isinstance(action, str) and action.startswith("mouse_"):
-            btn = {
+            return {
                 "mouse_left": Button.left,
                 "mouse_right": Button.right,
                 "mouse_middle": Button.middle
             }.get(action, Button.left)
-            (mouse.press if press else mouse.release)(btn)
+        if isinstance(action, str) and action.startswith("Key."):
+            return getattr(Key, action.split(".")[1], None)
+        return action
+
+    def press_action(self, action, press=True):
+        if action is None:
+            return
+        # press/release must never be dropped, or a key could stay held down
+        self._action_q.put((action, press, 0))
+
+    def tap_action(self, action, tap_ms=40):
+        if action is None or action in self._tapping:
+            return
+        self._tapping.add(action)
+        try:
+            self._action_q.put_nowait((action, True, max(1, tap_ms)))
+        except queue.Full:
+            self._tapping.discard(action)
+
+    def _action_loop(self):
+        # taps are pressed right away and their releases kept in a deadline heap,
+        # so the thread never sleeps through other queued presses
+        releases = []  # (deadline, seq, action)
+        seq = itertools.count()
+        while True:
+            timeout = max(0.0, releases[0][0] - time.perf_counter()) if releases else None
+            try:
+                item = self._action_q.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+            if item is None:
+                break
+            if item:
+                action, press, tap_ms = item
+                self._send_action(action, press)
+                if tap_ms > 0:
+                    heapq.heappush(releases, (time.perf_counter() + tap_ms / 1000.0, next(seq), action))
+            now = time.perf_counter()
+            while releases and releases[0][0] <= now:
+                _, _, action = heapq.heappop(releases)
+                self._send_action(action, False)
+                self._tapping.discard(action)
+        # stopping: don't leave tapped keys held down
+        for _, _, action in releases:
+            self._send_action(action, False)
+        self._tapping.clear()
+
+    def _send_action(self, action, press):
+        if isinstance(action, Button):
+            (mouse.press if press else mouse.release)(action)
         else:
-            key = self.get_key(action)
             try:
-                (keyboard.press if press else keyboard.release)(key)
+                (keyboard.press if press else keyboard.release)(action)
             except Exception:
                 pass
 
-    def tap_action(self, action, tap_ms=40):
-        if not action or action == "none":
-            return
-        self.press_action(action, True)
-        t_end = time.perf_counter() + (tap_ms / 1000.0)
-        while time.perf_counter() < t_end:
-            pass
-        self.press_action(action, False)
-
-    def is_pinch(self, hand):
-        x1, y1 = hand.landmark[4].x, hand.landmark[4].y
-        x2, y2 = hand.landmark[8].x, hand.landmark[8].y
-        dist = math.hypot(x2 - x1, y2 - y1)
-        return dist < self.get_threshold("pinch_dist", 0.05)
-
-    def is_fist(self, hand):
-        return (
-            hand.landmark[8].y  > hand.landmark[5].y  and
-            hand.landmark[12].y > hand.landmark[9].y  and
-            hand.landmark[16].y > hand.landmark[13].y and
-            hand.landmark[20].y > hand.landmark[17].y
-        )
-
-    def finger_extended(self, hand, tip_id, pip_id):
-        margin = 0.01
-        return (hand.landmark[tip_id].y + margin) < hand.landmark[pip_id].y
-
-    def is_two_fingers_V(self, hand):
-        index_ext  = self.finger_extended(hand, 8, 6)
-        middle_ext = self.finger_extended(hand, 12, 10)
-        ring_fold  = not self.finger_extended(hand, 16, 14)
-        pinky_fold = not self.finger_extended(hand, 20, 18)
-        min_split = self.get_threshold("two_split_min", 0.02)
-        x_index  = hand.landmark[8].x
-        x_middle = hand.landmark[12].x
-        lateral_split_ok = abs(x_index - x_middle) > min_split
-        return index_ext and middle_ext and ring_fold and pinky_fold and lateral_split_ok
-
     def handle_gesture(self, gesture_key, active_now):
-        cfg = self.get_assignment(gesture_key)
-        if cfg is None:
+        row = self._cfg.assignments.get(gesture_key)
+        if row is None:
             return
-        mode = cfg["mode"]
-        action = cfg["action"]
+        mode = row.mode
+        action = row.resolved
         if mode == "hold":
             if active_now and not self.pressed[gesture_key]:
                 self.press_action(action, True)
@@ -181,11 +275,10 @@ class VideoWorker(QtCore.QThread):
                 self.pressed[gesture_key] = False
         elif mode == "repeat":
             if active_now:
-                hz = max(1.0, float(cfg.get("repeat_hz", 8.0)))
-                period = 1.0 / hz
+                period = 1.0 / max(1.0, row.repeat_hz)
                 now = time.perf_counter()
                 if now - self.last_fire_ts[gesture_key] >= period:
-                    self.tap_action(action, tap_ms=cfg.get("tap_ms", 40))
+                    self.tap_action(action, tap_ms=row.tap_ms)
                     self.last_fire_ts[gesture_key] = now
                 self.pressed[gesture_key] = True
             else:
@@ -194,36 +287,68 @@ class VideoWorker(QtCore.QThread):
 
     def run(self):
         self.cap = cv2.VideoCapture(0)
-        self.hands = self.mp_hands.Hands(min_detection_confidence=0.7,
-                                         min_tracking_confidence=0.7,
+        # keep only the freshest frame queued; MJPG is cheaper to decode than the default YUYV
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        w = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        h = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if w and h:
+            self._set_frame_size(w, h)
+        self.hands = self.mp_hands.Hands(model_complexity=0,
+                                         min_detection_confidence=0.7,
+                                         min_tracking_confidence=0.5,
                                          max_num_hands=2)
+        warm_up_kernels()
+        self._action_thread = threading.Thread(target=self._action_loop, daemon=True)
+        self._action_thread.start()
         self._running = True
         last_status = ""
+        last_process_ts = 0.0
 
         while self._running:
-            ok, frame = self.cap.read()
+            # grab() only advances the stream; decode the frame only when we process it
+            if not self.cap.grab():
+                time.sleep(0.05)
+                continue
+            now = time.perf_counter()
+            idle = self._no_hand_streak > self.idle_after
+            period = 1.0 / (self.idle_hz if idle else self.target_hz)
+            if now - last_process_ts < period:
+                continue
+            ok, frame = self.cap.retrieve()
             if not ok:
                 time.sleep(0.05)
                 continue
+            last_process_ts = now
+            if not self._frame_w:  # capture didn't report its size; take it from the first frame
+                self._set_frame_size(frame.shape[1], frame.shape[0])
 
-            if self.settings.get("mirror_view", True):
+            cfg = self._cfg
+            if cfg.mirror_view:
                 frame = cv2.flip(frame, 1)
 
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if self._infer_size:
+                small = cv2.resize(frame, self._infer_size, dst=self._small_buf, interpolation=cv2.INTER_AREA)
+            else:
+                small = frame
+            # use the returned array: OpenCV reallocates dst if the frame ever differs from the reported size
+            rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
             res = self.hands.process(rgb)
 
             if res.multi_hand_landmarks and res.multi_handedness:
+                self._no_hand_streak = 0
                 parts = []
                 for handLms, handType in zip(res.multi_hand_landmarks, res.multi_handedness):
-                    if self.settings.get("debug_draw", True):
+                    if cfg.debug_draw:
                         self.mp_draw.draw_landmarks(frame, handLms, self.mp_hands.HAND_CONNECTIONS)
 
                     raw_label = handType.classification[0].label
                     label = self.resolve_hand_label(raw_label)
 
-                    pinch = self.is_pinch(handLms)
-                    fist  = self.is_fist(handLms)
-                    two   = self.is_two_fingers_V(handLms)
+                    lm = fill_landmarks(handLms, self._lm_buf)
+                    pinch = is_pinch_nb(lm, cfg.pinch_thr2)
+                    fist  = is_fist_nb(lm)
+                    two   = is_two_fingers_V_nb(lm, cfg.two_split_min)
 
                     if label == "Left":
                         self.handle_gesture("left_pinch", pinch)
@@ -243,21 +368,30 @@ class VideoWorker(QtCore.QThread):
                 status = " | ".join(parts)
             else:
                 status = "No hands"
+                self._no_hand_streak += 1
                 for k in list(self.pressed.keys()):
                     if self.pressed[k]:
-                        cfg = self.get_assignment(k)
-                        if cfg: self.press_action(cfg["action"], False)
+                        row = cfg.assignments.get(k)
+                        if row: self.press_action(row.resolved, False)
                         self.pressed[k] = False
 
             if status != last_status:
                 self.status_update.emit(status)
                 last_status = status
 
-            h, w, ch = frame.shape
-            qimg = QtGui.QImage(frame.data, w, h, ch*w, QtGui.QImage.Format_BGR888)
-            self.frame_ready.emit(qimg)
+            self._frame_emit_count += 1
+            if self._frame_emit_count % self.preview_every == 0:
+                self.frame_ready.emit(self._make_preview(frame))
 
-            time.sleep(0.01)
+            # while idle, sleep out the rest of the period instead of grabbing frames we'd skip;
+            # +1 ms so the period gate above has passed when we wake up
+            if idle:
+                sleep_for = period - (time.perf_counter() - now)
+                if sleep_for > 0:
+                    self.msleep(int(sleep_for * 1000) + 1)
+
+        self._action_q.put(None)
+        self._action_thread.join()
 
         try:
             if self.cap: self.cap.release()
@@ -265,6 +399,27 @@ class VideoWorker(QtCore.QThread):
         except Exception:
             pass
 
+    def _set_frame_size(self, w, h):
+        # everything below depends only on the capture resolution, so it is computed once
+        self._frame_w, self._frame_h = w, h
+        if w > self.infer_width:
+            self._infer_size = (self.infer_width, h * self.infer_width // w)
+            self._small_buf = np.empty((self._infer_size[1], self._infer_size[0], 3), dtype=np.uint8)
+        else:
+            self._infer_size = None
+            self._small_buf = None
+        iw, ih = self._infer_size or (w, h)
+        self._rgb_buf = np.empty((ih, iw, 3), dtype=np.uint8)
+        self._preview_size = (self.preview_width, h * self.preview_width // w)
+        self._preview_stride = 3 * self.preview_width
+        self._preview_buf = np.empty((self._preview_size[1], self._preview_size[0], 3), dtype=np.uint8)
+
+    def _make_preview(self, frame):
+        pw, ph = self._preview_size
+        cv2.resize(frame, self._preview_size, dst=self._preview_buf, interpolation=cv2.INTER_NEAREST)
+        # copy() detaches the image from the buffer we keep overwriting
+        return QtGui.QImage(self._preview_buf.data, pw, ph, self._preview_stride, QtGui.QImage.Format_BGR888).copy()
+
     def stop(self):
         self._running = False
         self.wait()
@@ -284,6 +439,12 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.settings = self.load_settings_from_file()
 
+        # coalesce bursts of control edits (spinbox ticks, typing) into one settings push
+        self._apply_timer = QtCore.QTimer(self)
+        self._apply_timer.setSingleShot(True)
+        self._apply_timer.setInterval(100)
+        self._apply_timer.timeout.connect(self._do_apply_controls)
+
         # central layout
         central = QtWidgets.QWidget()
         self.setCentralWidget(central)
@@ -298,6 +459,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.video_label = QtWidgets.QLabel()
         self.video_label.setAlignment(QtCore.Qt.AlignCenter)
         self.video_label.setFixedSize(960, 540)  # 16:9
+        self._video_sz = self.video_label.size()  # cached for on_frame, refreshed in resizeEvent
         self.video_label.setStyleSheet("background:#000; border-radius:12px;")
         self._blacken_video()
         left.addWidget(self.video_label)
@@ -404,7 +566,12 @@ class MainWindow(QtWidgets.QMainWindow):
         self.sld_two.valueChanged.connect(self.apply_controls_to_settings)
 
         self.file_watcher = QtCore.QFileSystemWatcher([SETTINGS_FILE] if os.path.exists(SETTINGS_FILE) else [])
-        self.file_watcher.fileChanged.connect(self.on_external_settings_changed)
+        # editors often write a file in several steps; reload once after the burst settles
+        self._reload_timer = QtCore.QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(200)
+        self._reload_timer.timeout.connect(self.on_external_settings_changed)
+        self.file_watcher.fileChanged.connect(lambda _path: self._reload_timer.start())
 
         self.worker = None
 
@@ -638,8 +805,7 @@ class MainWindow(QtWidgets.QMainWindow):
     def load_settings_from_file(self):
         if os.path.exists(SETTINGS_FILE):
             try:
-                with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                data = read_json(SETTINGS_FILE)
                 merged = DEFAULT_SETTINGS.copy()
                 merged.update(data)
                 if "thresholds" in data:
@@ -661,14 +827,16 @@ class MainWindow(QtWidgets.QMainWindow):
         self.settings["mirror_controls"] = bool(self.chk_mirror_controls.isChecked())
         self.settings["debug_draw"] = bool(self.chk_debug_draw.isChecked())
         try:
-            with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.settings, f, indent=2)
+            write_json(SETTINGS_FILE, self.settings)
             QtWidgets.QMessageBox.information(self, "Saved", "settings.json saved.")
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", f"Could not save settings.json:\n{e}")
 
     # ---------- UI handlers ----------
     def apply_controls_to_settings(self):
+        self._apply_timer.start()
+
+    def _do_apply_controls(self):
         self.settings["mirror_view"] = self.chk_mirror_view.isChecked()
         self.settings["mirror_controls"] = self.chk_mirror_controls.isChecked()
         self.settings["debug_draw"] = self.chk_debug_draw.isChecked()
@@ -704,7 +872,7 @@ class MainWindow(QtWidgets.QMainWindow):
     def save_to_file(self):
         self.save_settings_to_file()
 
-    def on_external_settings_changed(self, path):
+    def on_external_settings_changed(self):
         QtWidgets.QMessageBox.information(self, "settings.json", "External change detected. Reloading.")
         self.reload_from_file()
         if self.worker and self.worker.isRunning():
@@ -735,9 +903,15 @@ class MainWindow(QtWidgets.QMainWindow):
 
     # ---------- video frame display ----------
     def on_frame(self, qimg):
-        pix = QtGui.QPixmap.fromImage(qimg).scaled(self.video_label.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        pix = QtGui.QPixmap.fromImage(qimg)
+        if pix.size() != self._video_sz:
+            pix = pix.scaled(self._video_sz, QtCore.Qt.KeepAspectRatio, QtCore.Qt.FastTransformation)
         self.video_label.setPixmap(pix)
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._video_sz = self.video_label.size()
+
     def on_status(self, text):
         self.status_label.setText("Status: " + text)
 
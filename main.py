@@ -1,15 +1,24 @@
 import os
+import sys
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"  # (optional) reduce TFLite warnings
 
 import cv2
 import mediapipe as mp
-import math
+from mediapipe.tasks import python as mp_tasks
+from mediapipe.tasks.python import vision
+import numpy as np
 import json
 import time
+import signal
+import heapq
+import itertools
+import threading
+from queue import Queue, Empty, Full
+from collections import namedtuple
 from pynput.keyboard import Controller as KeyboardController, Key
 from pynput.mouse import Controller as MouseController, Button
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from gesture_kernels import classify_hands_nb, warm_up as warm_up_kernels
+import native_keys
 
 # --- Keyboard & Mouse ---
 keyboard = KeyboardController()
@@ -24,47 +33,220 @@ settings = {
         "pinch_dist": 0.05,
         "two_split_min": 0.02
     },
-    "debug_draw": True           # draw landmark connections
+    "debug_draw": False,         # draw landmark connections
+    "headless": False,           # no preview window; stop with Ctrl+C / SIGTERM
+    "infer_every": 2             # run hand inference on every Nth frame (display still gets all)
 }
 
-# --- JSON Watcher ---
-class JSONHandler(FileSystemEventHandler):
-    def on_modified(self, event):
-        if event.src_path.endswith("settings.json"):
-            load_settings()
+# --- Assignment resolution (rebuilt on every settings load, not per frame) ---
+MOUSE_BUTTONS = {
+    "mouse_left": Button.left,
+    "mouse_right": Button.right,
+    "mouse_middle": Button.middle
+}
+
+# mode, tagged action (see resolve_action, None = unmapped), repeat period (s), tap length (ns)
+ResolvedAssignment = namedtuple("ResolvedAssignment", "mode action period tap_ns")
+_resolved = {}
+_action_cache = {}  # action string -> ("M" | "K" | "N", object); cleared on settings load
+
+def get_assignment(gesture_key, items=None):
+    """
+    assignments[gesture_key] can be either a string or an object.
+    Object format:
+      {"action": "Key.space" or "w" or "mouse_left",
+       "mode": "hold" | "repeat",
+       "repeat_hz": 10,
+       "tap_ms": 40}
+    """
+    item = (assignments if items is None else items).get(gesture_key)
+    if item is None:
+        return None
+    if isinstance(item, str):
+        # backward compatibility: only action provided
+        return {"action": item, "mode": "hold", "repeat_hz": 8, "tap_ms": 40}
+    # fill missing fields with defaults
+    return {
+        "action": item.get("action"),
+        "mode": item.get("mode", "hold"),
+        "repeat_hz": float(item.get("repeat_hz", 8)),
+        "tap_ms": int(item.get("tap_ms", 40))
+    }
+
+def get_key(key_str):
+    if isinstance(key_str, str) and key_str.startswith("Key."):
+        return getattr(Key, key_str.split(".")[1], None)
+    return key_str
+
+def resolve_action(action):
+    """
+    Action string -> ("M", Button) for the mouse, ("N", KeyEvents) for a key sent
+    natively (Windows SendInput), or ("K", Key / char) for a key sent through pynput.
+    """
+    r = _action_cache.get(action)
+    if r is None:
+        if not action or action == "none":
+            return None
+        if isinstance(action, str) and action.startswith("mouse_"):
+            r = ("M", MOUSE_BUTTONS.get(action, Button.left))
+        else:
+            key = get_key(action)
+            if key is None:
+                return None
+            events = native_keys.make_key_events(key)
+            r = ("N", events) if events else ("K", key)
+        _action_cache[action] = r
+    return r
+
+def build_resolved(items):
+    """ResolvedAssignment per mapped gesture in items; null entries are left unmapped"""
+    resolved = {}
+    for gesture_key in items:
+        cfg = get_assignment(gesture_key, items)
+        if cfg is None:
+            continue
+        period = 1.0 / max(1.0, float(cfg["repeat_hz"]))
+        tap_s = cfg["tap_ms"] / 1000.0
+        if tap_s >= period:
+            # a tap this long would run into the next one; keep the key up for a full period in between
+            period += tap_s
+        resolved[gesture_key] = ResolvedAssignment(
+            mode=cfg["mode"],
+            action=resolve_action(cfg["action"]),
+            period=period,
+            tap_ns=cfg["tap_ms"] * 1_000_000)
+    return resolved
+
+# --- JSON reload (polled from the main loop via the file's mtime) ---
+SETTINGS_FILE = "settings.json"
+SETTINGS_CHECK_EVERY = 60  # frames between mtime checks
+_settings_mtime = 0
+
+def settings_mtime():
+    try:
+        return os.stat(SETTINGS_FILE).st_mtime_ns
+    except OSError:
+        return _settings_mtime
+
+# per-frame gesture thresholds, refreshed in load_settings (pinch is stored squared)
+_PINCH_THR2 = 0.05 ** 2
+_TWO_SPLIT_MIN = 0.02
+_INFER_EVERY = 2  # run hand inference on every Nth frame, refreshed in load_settings
 
 def load_settings():
-    global assignments, settings
+    global assignments, _resolved, _PINCH_THR2, _TWO_SPLIT_MIN, _INFER_EVERY
     try:
-        with open("settings.json", "r", encoding="utf-8") as f:
+        with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
             data = json.load(f)
+        # build everything first, so a bad file leaves the previous settings fully in place
         # accept assignments (can be string or object)
-        assignments = data.get("assignments", {})
+        new_assignments = data.get("assignments") or {}
         # general parameters
-        settings.update({k: v for k, v in data.items() if k != "assignments"})
+        new_settings = {**settings, **{k: v for k, v in data.items() if k != "assignments"}}
+        thresholds = new_settings.get("thresholds", {})
+        # clamp before squaring: a negative threshold must still never match, as with hypot() < thr
+        pinch_thr2 = max(0.0, float(thresholds.get("pinch_dist", 0.05))) ** 2
+        two_split_min = float(thresholds.get("two_split_min", 0.02))
+        infer_every = max(1, int(new_settings.get("infer_every", 2)))
+        _action_cache.clear()
+        resolved = build_resolved(new_assignments)
+
+        assignments = new_assignments
+        settings.update(new_settings)
+        _PINCH_THR2, _TWO_SPLIT_MIN = pinch_thr2, two_split_min
+        _INFER_EVERY = infer_every
+        _resolved = resolved
         print("Settings updated.")
     except Exception as e:
         print("Settings load error:", e)
 
 # Initial JSON read
+_settings_mtime = settings_mtime()
 load_settings()
 
-# Observer thread
-observer = Observer()
-observer.schedule(JSONHandler(), path=".", recursive=False)
-observer.start()
+# --- Mediapipe Hand Landmarker (Tasks API) ---
+# point "model_path" in settings.json at a lighter landmarker bundle to trade accuracy for speed
+MODEL_PATH = settings.get("model_path", "hand_landmarker.task")
+
+# LIVE_STREAM mode runs inference on MediaPipe's own thread, so capture and inference overlap.
+# Only one frame is in flight at a time: detect_async holds the GIL while it waits on a busy graph,
+# and the result callback needs the GIL, so flooding it can deadlock. Results come back through
+# a 1-slot queue: a newer result replaces one the main loop hasn't picked up yet.
+result_q = Queue(maxsize=1)
+INFER_STALL_NS = 1_000_000_000  # send again if a frame never produced a result
+infer_pending = False           # a frame is in the graph; cleared by on_result
+infer_sent_ns = 0
+last_ts_ms = -1                 # timestamp of the last detect_async call
+
+def on_result(result, output_image, timestamp_ms):
+    global infer_pending
+    # only the newest frame's result frees the graph: after a stall re-send, a late result
+    # for the old frame must not let a second frame in while the re-sent one is still running
+    if timestamp_ms == last_ts_ms:
+        infer_pending = False
+    try:
+        result_q.get_nowait()
+    except Empty:
+        pass
+    try:
+        result_q.put_nowait(result)
+    except Full:
+        pass
+
+def create_landmarker(delegate):
+    options = vision.HandLandmarkerOptions(
+        base_options=mp_tasks.BaseOptions(model_asset_path=MODEL_PATH, delegate=delegate),
+        running_mode=vision.RunningMode.LIVE_STREAM,
+        num_hands=2,
+        min_hand_detection_confidence=0.7,
+        min_hand_presence_confidence=0.7,
+        min_tracking_confidence=0.5,  # keep tracking the previous box; palm detection reruns less often
+        result_callback=on_result)
+    return vision.HandLandmarker.create_from_options(options)
+
+# a missing model also fails with RuntimeError, which would read as a GPU problem below
+if not os.path.exists(MODEL_PATH):
+    sys.exit(f"[ERR] Hand landmarker model not found: {MODEL_PATH} (see README.md for the download link)")
 
-# --- Mediapipe Hands ---
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(min_detection_confidence=0.7,
-                       min_tracking_confidence=0.7,
-                       max_num_hands=2)
-mp_draw = mp.solutions.drawing_utils
+try:
+    landmarker = create_landmarker(mp_tasks.BaseOptions.Delegate.GPU)
+except (NotImplementedError, RuntimeError) as e:
+    # GPU delegate isn't available on every platform/build; XNNPACK CPU always is
+    print("GPU delegate unavailable, falling back to CPU:", e)
+    landmarker = create_landmarker(mp_tasks.BaseOptions.Delegate.CPU)
 
 # Camera
 cap = cv2.VideoCapture(0)
+# small MJPG frames: less USB/decode bandwidth, and MediaPipe downsizes to ~224px anyway
+cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+cap.set(cv2.CAP_PROP_FPS, 30)
+cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # don't let stale frames queue up in the driver
+fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+if fourcc != cv2.VideoWriter_fourcc(*"MJPG"):
+    print("[WARN] Camera did not accept MJPG, using:", fourcc.to_bytes(4, "little").decode(errors="replace"))
+
+MAX_FLUSH_GRABS = 4  # upper bound on stale frames dropped per iteration
+
+def grab_latest():
+    """
+    Drop frames that queued up while we were busy, without decoding them.
+    A grab() that returns immediately came from the queue; one that had to
+    wait for the camera is fresh, so we stop there.
+    """
+    for _ in range(MAX_FLUSH_GRABS):
+        t0 = time.perf_counter()
+        if not cap.grab():
+            return False
+        if time.perf_counter() - t0 > 0.005:
+            break
+    return True
 
 # --- State ---
+rgb_buf = None  # reused BGR->RGB destination, (re)allocated when the frame size changes
+hands = []      # (landmarks, SIDE_KEYS entry, gesture flags) per hand from the latest result
+
 pressed = {
     "left_pinch": False,
     "right_pinch": False,
@@ -74,6 +256,12 @@ pressed = {
     "right_two": False
 }
 
+# gesture keys per hand side, in (pinch, fist, two) order
+SIDE_KEYS = {
+    "Left":  ("left_pinch", "left_fist", "left_two"),
+    "Right": ("right_pinch", "right_fist", "right_two")
+}
+
 # last-fire timestamps for repeat mode
 last_fire_ts = {
     "left_pinch": 0.0,
@@ -85,123 +273,133 @@ last_fire_ts = {
 }
 
 # --- Helper: settings helpers ---
-def get_threshold(name, default):
-    return settings.get("thresholds", {}).get(name, default)
-
 def resolve_hand_label(label):
     """
     Returns the actual MediaPipe hand label ("Left"/"Right").
     If mirror_controls=True, swap left/right for control logic.
+    MediaPipe always sees the unflipped frame, so mirror_view (display only)
+    swaps the label too, matching what a mirrored input would have reported.
     """
-    if settings.get("mirror_controls", False):
+    if settings.get("mirror_view", True) != settings.get("mirror_controls", False):
         return "Right" if label == "Left" else "Left"
     return label
 
-def get_assignment(gesture_key):
-    """
-    assignments[gesture_key] can be either a string or an object.
-    Object format:
-      {"action": "Key.space" or "w" or "mouse_left",
-       "mode": "hold" | "repeat",
-       "repeat_hz": 10,
-       "tap_ms": 40}
-    """
-    item = assignments.get(gesture_key)
-    if item is None:
-        return None
-    if isinstance(item, str):
-        # backward compatibility: only action provided
-        return {"action": item, "mode": "hold", "repeat_hz": 8, "tap_ms": 40}
-    # fill missing fields with defaults
-    return {
-        "action": item.get("action"),
-        "mode": item.get("mode", "hold"),
-        "repeat_hz": float(item.get("repeat_hz", 8)),
-        "tap_ms": int(item.get("tap_ms", 40))
-    }
-
-# --- Gesture Helpers ---
-def is_pinch(hand):
-    x1, y1 = hand.landmark[4].x, hand.landmark[4].y     # thumb tip
-    x2, y2 = hand.landmark[8].x, hand.landmark[8].y     # index finger tip
-    dist = math.hypot(x2 - x1, y2 - y1)
-    return dist < get_threshold("pinch_dist", 0.05)
-
-def is_fist(hand):
-    # if fingertip is below PIP (y is larger), treat as folded
-    return (
-        hand.landmark[8].y  > hand.landmark[5].y  and
-        hand.landmark[12].y > hand.landmark[9].y  and
-        hand.landmark[16].y > hand.landmark[13].y and
-        hand.landmark[20].y > hand.landmark[17].y
-    )
-
-def finger_extended(hand, tip_id, pip_id):
-    margin = 0.01
-    return (hand.landmark[tip_id].y + margin) < hand.landmark[pip_id].y
-
-def is_two_fingers_V(hand):
-    index_ext  = finger_extended(hand, 8, 6)
-    middle_ext = finger_extended(hand, 12, 10)
-    ring_fold  = not finger_extended(hand, 16, 14)
-    pinky_fold = not finger_extended(hand, 20, 18)
-    min_split = get_threshold("two_split_min", 0.02)
-    x_index  = hand.landmark[8].x
-    x_middle = hand.landmark[12].x
-    lateral_split_ok = abs(x_index - x_middle) > min_split
-    return index_ext and middle_ext and ring_fold and pinky_fold and lateral_split_ok
-
-def get_key(key_str):
-    if isinstance(key_str, str) and key_str.startswith("Key."):
-        return getattr(Key, key_str.split(".")[1])
-    return key_str
+# --- Debug drawing: the hand skeleton as landmark index chains, one polyline each ---
+HAND_CHAINS = [np.array(c) for c in (
+    (0, 1, 2, 3, 4),        # thumb
+    (0, 5, 6, 7, 8),        # index
+    (9, 10, 11, 12),        # middle
+    (13, 14, 15, 16),       # ring
+    (0, 17, 18, 19, 20),    # pinky
+    (5, 9, 13, 17),         # palm
+)]
+
+def draw_hand(img, lm):
+    """Draw one hand from its (21, 3) normalized landmarks with a single polylines call"""
+    h, w = img.shape[:2]
+    px = (lm[:, :2] * (w, h)).astype(np.int32)
+    cv2.polylines(img, [px[c] for c in HAND_CHAINS], False, (255, 255, 255), 2)
+
+# --- Stop flag (set from SIGINT / SIGTERM, used in headless mode where there's no ESC key) ---
+stop_flag = False
+
+def request_stop(signum, frame):
+    global stop_flag
+    stop_flag = True
+
+signal.signal(signal.SIGINT, request_stop)
+signal.signal(signal.SIGTERM, request_stop)
+
+# --- Gesture Helpers (landmarks as a (21, 3) float32 array: x, y, z per row) ---
+# reused every result (num_hands=2): no per-frame ndarray allocation on the gesture path
+_LM_BUF = np.empty((2, 21, 3), dtype=np.float32)
+_GESTURE_BUF = np.empty((2, 3), dtype=np.bool_)
+
+def landmarks_array(hands):
+    """Detected hands written into _LM_BUF in place; returns the filled (H, 21, 3) view."""
+    # filled element by element: no intermediate per-landmark tuples or nested lists
+    n = min(len(hands), len(_LM_BUF))
+    for h in range(n):
+        hand = hands[h]
+        for i in range(21):
+            p = hand[i]
+            _LM_BUF[h, i, 0] = p.x
+            _LM_BUF[h, i, 1] = p.y
+            _LM_BUF[h, i, 2] = p.z
+    return _LM_BUF[:n]
 
 def press_action(action, press=True):
-    if not action:
+    """action is a tagged ("M" | "K" | "N", object) pair from resolve_action"""
+    if action is None:
         return
-    if isinstance(action, str) and action.startswith("mouse_"):
-        btn = {
-            "mouse_left": Button.left,
-            "mouse_right": Button.right,
-            "mouse_middle": Button.middle
-        }.get(action, Button.left)
+    kind, obj = action
+    try:
+        if kind == "N":
+            native_keys.send(obj.down if press else obj.up)
+            return
+        device = mouse if kind == "M" else keyboard
         if press:
-            mouse.press(btn)
+            device.press(obj)
         else:
-            mouse.release(btn)
-    else:
-        key = get_key(action)
-        try:
-            if press:
-                keyboard.press(key)
-            else:
-                keyboard.release(key)
-        except Exception as e:
-            print("None")
-
-def tap_action(action, tap_ms=40):
-    """Short tap (press then release after a brief delay)"""
-    if not action:
+            device.release(obj)
+    except Exception as e:
+        print("None")
+
+# scheduled tap releases: (deadline_ns, seq, action); seq keeps ties from comparing actions.
+# A releaser thread sleeps until the earliest deadline, so tap length doesn't depend on frame timing.
+pending_releases = []
+_release_seq = itertools.count()
+_release_cv = threading.Condition()
+_tapping = set()  # actions whose release is still pending; taps never overlap
+
+def tap_action(action, tap_ns=40_000_000):
+    """Short tap: press now, the releaser thread releases it tap_ns later (skipped while still tapping)"""
+    if action is None:
         return
+    with _release_cv:
+        if action in _tapping:
+            return
+        _tapping.add(action)
     press_action(action, True)
-    # Tiny delay (keep ultra small to avoid blocking)
-    t_end = time.perf_counter() + (tap_ms / 1000.0)
-    while time.perf_counter() < t_end:
-        pass
-    press_action(action, False)
+    deadline = time.perf_counter_ns() + tap_ns
+    with _release_cv:
+        heapq.heappush(pending_releases, (deadline, next(_release_seq), action))
+        _release_cv.notify()
+
+def release_due(now_ns):
+    """Release every tapped action whose deadline has passed (call with _release_cv held)"""
+    while pending_releases and pending_releases[0][0] <= now_ns:
+        _, _, action = heapq.heappop(pending_releases)
+        press_action(action, False)
+        _tapping.discard(action)
+
+def release_loop():
+    with _release_cv:
+        while True:
+            now = time.perf_counter_ns()
+            release_due(now)
+            timeout = (pending_releases[0][0] - now) / 1e9 if pending_releases else None
+            _release_cv.wait(timeout)
+
+# Windows timers default to ~15.6 ms ticks, too coarse for 10-40 ms taps
+if sys.platform == "win32":
+    import ctypes
+    ctypes.windll.winmm.timeBeginPeriod(1)
+
+threading.Thread(target=release_loop, daemon=True).start()
 
 def handle_gesture(gesture_key, active_now):
     """
     Manages both HOLD and REPEAT logic for each gesture.
     """
     global pressed, last_fire_ts
-    cfg = get_assignment(gesture_key)
+    cfg = _resolved.get(gesture_key)
     if cfg is None:
         # nothing mapped
         return
 
-    mode = cfg["mode"]
-    action = cfg["action"]
+    mode = cfg.mode
+    action = cfg.action
 
     # HOLD mode: on enter press, on exit release
     if mode == "hold":
@@ -215,11 +413,9 @@ def handle_gesture(gesture_key, active_now):
     # REPEAT mode: while active, send periodic "tap"
     elif mode == "repeat":
         if active_now:
-            hz = max(1.0, float(cfg.get("repeat_hz", 8.0)))
-            period = 1.0 / hz
             now = time.perf_counter()
-            if now - last_fire_ts[gesture_key] >= period:
-                tap_action(action, tap_ms=cfg.get("tap_ms", 40))
+            if now - last_fire_ts[gesture_key] >= cfg.period:
+                tap_action(action, tap_ns=cfg.tap_ns)
                 last_fire_ts[gesture_key] = now
             pressed[gesture_key] = True
         else:
@@ -227,52 +423,87 @@ def handle_gesture(gesture_key, active_now):
             pressed[gesture_key] = False
             last_fire_ts[gesture_key] = 0.0
 
+# Load the compiled gesture kernels now rather than on the first frame with a hand
+warm_up_kernels()
+
 # --- Main Loop ---
+frame_idx = 0
+last_infer_frame = 0
 try:
-    while True:
-        success, img = cap.read()
+    while not stop_flag:
+        frame_idx += 1
+        if frame_idx % SETTINGS_CHECK_EVERY == 0:
+            mtime = settings_mtime()
+            if mtime != _settings_mtime:
+                _settings_mtime = mtime
+                load_settings()
+
+        # decode only the freshest frame
+        success = grab_latest()
+        if success:
+            success, img = cap.retrieve()
         if not success:
             print("[ERR] Failed to read from camera.")
             break
 
-        # Mirror view (if enabled)
+        # gestures change far slower than the camera rate; in-between frames reuse the last result
+        now_ns = time.perf_counter_ns()
+        if (frame_idx - last_infer_frame >= _INFER_EVERY and
+                (not infer_pending or now_ns - infer_sent_ns > INFER_STALL_NS)):
+            last_infer_frame = frame_idx
+            if rgb_buf is None or rgb_buf.shape != img.shape:
+                rgb_buf = np.empty_like(img)
+            cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+            # mp.Image copies the pixels, so rgb_buf can be overwritten next frame
+            # detect_async rejects a timestamp that isn't strictly larger than the previous one
+            last_ts_ms = max(now_ns // 1_000_000, last_ts_ms + 1)
+            infer_pending, infer_sent_ns = True, now_ns
+            landmarker.detect_async(mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_buf), last_ts_ms)
+
+        headless = settings.get("headless", False)
+        # classify only when a new result arrived; frames in between reuse the last one
+        try:
+            result = result_q.get_nowait()
+        except Empty:
+            pass
+        else:
+            hands = []
+            if result.hand_landmarks:
+                # Compute gestures for every hand at once
+                pts = landmarks_array(result.hand_landmarks)
+                gestures = classify_hands_nb(pts, _PINCH_THR2, _TWO_SPLIT_MIN, _GESTURE_BUF[:len(pts)])
+                for lm, handType, active in zip(pts, result.handedness, gestures):
+                    # "Left"/"Right" (swap if mirror control is enabled)
+                    raw_label = handType[0].category_name  # "Left" or "Right"
+                    label = resolve_hand_label(raw_label)
+                    hands.append((lm, SIDE_KEYS.get(label), active))
+
+        draw = settings.get("debug_draw", False) and not headless
+        for lm, keys, active in hands:
+
+            if draw:
+                draw_hand(img, lm)
+
+            if not keys:
+                continue
+            for gesture_key, is_active in zip(keys, active):
+                handle_gesture(gesture_key, is_active)
+
+        if headless:
+            continue
+
+        # mirror is display-only; landmarks were drawn on the unflipped frame, so they flip along
         if settings.get("mirror_view", True):
-            img = cv2.flip(img, 1)
-
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        result = hands.process(img_rgb)
-
-        if result.multi_hand_landmarks and result.multi_handedness:
-            for handLms, handType in zip(result.multi_hand_landmarks, result.multi_handedness):
-
-                if settings.get("debug_draw", True):
-                    mp_draw.draw_landmarks(img, handLms, mp_hands.HAND_CONNECTIONS)
-
-                # "Left"/"Right" (swap if mirror control is enabled)
-                raw_label = handType.classification[0].label  # "Left" or "Right"
-                label = resolve_hand_label(raw_label)
-
-                # Compute gestures
-                pinch = is_pinch(handLms)
-                fist  = is_fist(handLms)
-                two   = is_two_fingers_V(handLms)
-
-                if label == "Left":
-                    handle_gesture("left_pinch", pinch)
-                    handle_gesture("left_fist",  fist)
-                    handle_gesture("left_two",   two)
-
-                elif label == "Right":
-                    handle_gesture("right_pinch", pinch)
-                    handle_gesture("right_fist",  fist)
-                    handle_gesture("right_two",   two)
-
+            cv2.flip(img, 1, dst=img)
         cv2.imshow("Hand Control", img)
         if cv2.waitKey(1) & 0xFF == 27:  # ESC
             break
 
 finally:
-    observer.stop()
-    observer.join()
+    with _release_cv:
+        release_due(float("inf"))
+    if sys.platform == "win32":
+        ctypes.windll.winmm.timeEndPeriod(1)
+    landmarker.close()
     cap.release()
     cv2.destroyAllWindows()
@@ -0,0 +1,115 @@
+"""
+Native keyboard events for main.py on Windows.
+
+Key down/up INPUT structs are built once per action (when settings load) and
+sent with a single user32.SendInput call. On other platforms, and for chars
+that need Shift/AltGr on the current layout, main.py keeps using pynput.
+"""
+import sys
+import ctypes
+
+available = sys.platform == "win32"
+
+INPUT_KEYBOARD = 1
+KEYEVENTF_EXTENDEDKEY = 0x0001
+KEYEVENTF_KEYUP = 0x0002
+MAPVK_VK_TO_VSC = 0
+
+# keys on the extended part of the keyboard: nav block, arrows, right Ctrl/Alt, Win/Apps, NumLock, num /
+EXTENDED_VKS = {
+    0x21, 0x22, 0x23, 0x24,        # Page Up, Page Down, End, Home
+    0x25, 0x26, 0x27, 0x28,        # arrows
+    0x2C, 0x2D, 0x2E,              # Print Screen, Insert, Delete
+    0x5B, 0x5C, 0x5D,              # left/right Win, Apps
+    0x6F, 0x90,                    # numpad divide, Num Lock
+    0xA3, 0xA5                     # right Ctrl, right Alt
+}
+
+ULONG_PTR = ctypes.c_size_t
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [("wVk", ctypes.c_ushort),
+                ("wScan", ctypes.c_ushort),
+                ("dwFlags", ctypes.c_ulong),
+                ("time", ctypes.c_ulong),
+                ("dwExtraInfo", ULONG_PTR)]
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [("dx", ctypes.c_long),
+                ("dy", ctypes.c_long),
+                ("mouseData", ctypes.c_ulong),
+                ("dwFlags", ctypes.c_ulong),
+                ("time", ctypes.c_ulong),
+                ("dwExtraInfo", ULONG_PTR)]
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [("uMsg", ctypes.c_ulong),
+                ("wParamL", ctypes.c_ushort),
+                ("wParamH", ctypes.c_ushort)]
+
+class _INPUTUNION(ctypes.Union):
+    # all three members so the union (and INPUT) has the size SendInput checks against
+    _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT), ("hi", HARDWAREINPUT)]
+
+class INPUT(ctypes.Structure):
+    _anonymous_ = ("u",)
+    _fields_ = [("type", ctypes.c_ulong), ("u", _INPUTUNION)]
+
+INPUT_SIZE = ctypes.sizeof(INPUT)
+
+if available:
+    user32 = ctypes.WinDLL("user32", use_last_error=True)
+    user32.SendInput.argtypes = (ctypes.c_uint, ctypes.POINTER(INPUT), ctypes.c_int)
+    user32.SendInput.restype = ctypes.c_uint
+    user32.VkKeyScanW.argtypes = (ctypes.c_wchar,)
+    user32.VkKeyScanW.restype = ctypes.c_short
+    user32.MapVirtualKeyW.argtypes = (ctypes.c_uint, ctypes.c_uint)
+    user32.MapVirtualKeyW.restype = ctypes.c_uint
+
+def key_vk(key):
+    """Virtual-key code for a pynput Key or a single char, None if it has to go through pynput"""
+    if isinstance(key, str):
+        if len(key) != 1:
+            return None
+        r = user32.VkKeyScanW(key)
+        if r == -1 or r & 0xFF00:  # not on this layout, or needs Shift/Ctrl/Alt held
+            return None
+        return r & 0xFF
+    return getattr(getattr(key, "value", None), "vk", None)
+
+class KeyEvents:
+    """Prebuilt key down/up INPUTs for one virtual key"""
+    __slots__ = ("vk", "down", "up")
+
+    def __init__(self, vk, down, up):
+        self.vk = vk
+        self.down = down
+        self.up = up
+
+    # ctypes structs aren't hashable, but main.py keeps actions in sets and dict keys
+    # (pending taps), so a key's identity is its vk
+    def __hash__(self):
+        return hash(self.vk)
+
+    def __eq__(self, other):
+        return isinstance(other, KeyEvents) and other.vk == self.vk
+
+def make_key_events(key):
+    """KeyEvents (down/up INPUT structs) for key, or None to fall back to pynput"""
+    if not available:
+        return None
+    vk = key_vk(key)
+    if not vk:
+        return None
+    scan = user32.MapVirtualKeyW(vk, MAPVK_VK_TO_VSC)
+    flags = KEYEVENTF_EXTENDEDKEY if vk in EXTENDED_VKS else 0
+    down = INPUT(type=INPUT_KEYBOARD)
+    down.ki = KEYBDINPUT(wVk=vk, wScan=scan, dwFlags=flags)
+    up = INPUT(type=INPUT_KEYBOARD)
+    up.ki = KEYBDINPUT(wVk=vk, wScan=scan, dwFlags=flags | KEYEVENTF_KEYUP)
+    return KeyEvents(vk, down, up)
+
+def send(event):
+    """Inject one prebuilt INPUT"""
+    if not user32.SendInput(1, ctypes.byref(event), INPUT_SIZE):
+        raise ctypes.WinError(ctypes.get_last_error())